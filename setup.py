@@ -6,11 +6,11 @@ from setuptools import setup, find_packages
 
 
 with open(
-    os.path.join(os.path.dirname(__file__), 'stellar', 'app.py')
-) as app_file:
+    os.path.join(os.path.dirname(__file__), 'stellar', 'version.py')
+) as version_file:
     VERSION = re.compile(
         r".*__version__ = '(.*?)'", re.S
-    ).match(app_file.read()).group(1)
+    ).match(version_file.read()).group(1)
 
 with open("README.md") as readme:
     long_description = readme.read()
@@ -33,6 +33,7 @@ setup(
     zip_safe=False,
     include_package_data=True,
     platforms='any',
+    python_requires='>=3.7',
     classifiers=[
         'Intended Audience :: Developers',
         'License :: OSI Approved :: BSD License',
@@ -40,18 +41,17 @@ setup(
         'Operating System :: Microsoft :: Windows',
         'Operating System :: MacOS :: MacOS X',
         'Topic :: Utilities',
-        'Programming Language :: Python :: 2',
         'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
         'Topic :: Database',
         'Topic :: Software Development :: Version Control',
     ],
     install_requires = [
         'PyYAML>=5.3.1',
-        'SQLAlchemy>=1.3.22',
-        'humanize>=2.6.0',
+        'SQLAlchemy>=1.4.0',
         'schema>=0.7.2',
-        'click>=7.1.2',
-        'SQLAlchemy-Utils>=0.36.8',
+        'click>=8.0.0',
+        'SQLAlchemy-Utils>=0.37.0',
         'psutil>=5.8.0',
         'wheel>=0.36.2',
         'psycopg2-binary>=2.8.6'
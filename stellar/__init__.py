@@ -1,7 +1,15 @@
-from . import app
-from . import command
-from . import config
-from . import models
-from . import operations
+import importlib
 
-__version__ = app.__version__
+from .version import __version__
+
+__all__ = ['app', 'command', 'config', 'models', 'operations']
+
+
+def __getattr__(name):
+    # Submodules are imported on first access so that light commands such as
+    # `stellar version` don't pay for importing SQLAlchemy.
+    if name in __all__:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError(
+        'module %r has no attribute %r' % (__name__, name)
+    )
@@ -1,8 +1,11 @@
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+import select
 import sys
 import click
 from functools import partial
+from time import sleep
 
 from .config import load_config
 from .models import Snapshot, Table, Base
@@ -14,17 +17,32 @@ from .operations import (
     rename_database,
     terminate_database_connections,
     list_of_databases,
+    SUPPORTED_DIALECTS,
 )
-from sqlalchemy import create_engine
+from .version import __version__
+import sqlalchemy as sa
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine.url import make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import ProgrammingError
 from psutil import pid_exists
 
 
-__version__ = '0.5.0'
 logger = logging.getLogger(__name__)
 
 
+def create_pooled_engine(url):
+    options = {'pool_pre_ping': True, 'pool_recycle': 1800}
+    # Pool sizing only applies to QueuePool, which SQLite doesn't use.
+    if make_url(url).get_backend_name() in SUPPORTED_DIALECTS:
+        options.update(pool_size=4, max_overflow=2)
+    return create_engine(url, **options)
+
+
+def get_snapshot_channel(snapshot):
+    return 'stellar_snapshot_%d' % snapshot.id
+
+
 class Operations(object):
     def __init__(self, raw_connection, config):
         self.terminate_database_connections = partial(
@@ -49,7 +67,7 @@ class Stellar(object):
         logging.basicConfig(level=self.config['logging'])
 
     def init_database(self):
-        self.raw_db = create_engine(self.config['url'])
+        self.raw_db = create_pooled_engine(self.config['url'])
         self.raw_conn = self.raw_db.connect()
         self.operations = Operations(self.raw_conn, self.config)
 
@@ -58,7 +76,7 @@ class Stellar(object):
         except AttributeError:
             logger.info('Could not set isolation level to 0')
 
-        self.db = create_engine(self.config['stellar_url'])
+        self.db = create_pooled_engine(self.config['stellar_url'])
         self.db.session = sessionmaker(bind=self.db)()
         self.raw_db.session = sessionmaker(bind=self.raw_db)()
         
@@ -84,12 +102,23 @@ class Stellar(object):
             Snapshot.project_name == self.config['project_name']
         ).first()
 
-    def get_snapshots(self):
-        return self.db.session.query(Snapshot).filter(
+    def snapshot_exists(self, snapshot_name):
+        return self.db.session.execute(
+            sa.select(sa.literal(1)).select_from(Snapshot).where(
+                Snapshot.snapshot_name == snapshot_name,
+                Snapshot.project_name == self.config['project_name']
+            ).limit(1)
+        ).scalar() is not None
+
+    def get_snapshots_listing(self):
+        return self.db.session.query(
+            Snapshot.snapshot_name,
+            Snapshot.created_at
+        ).filter(
             Snapshot.project_name == self.config['project_name']
         ).order_by(
             Snapshot.created_at.desc()
-        ).all()
+        ).yield_per(200)
 
     def get_latest_snapshot(self):
         return self.db.session.query(Snapshot).filter(
@@ -198,8 +227,78 @@ class Stellar(object):
                 table.get_table_name('slave')
             )
         snapshot.worker_pid = None
+        self.notify_slaves_ready(snapshot)
         self.db.session.commit()
 
+    def supports_notify(self):
+        return (
+            self.db.dialect.name == 'postgresql' and
+            self.db.dialect.driver == 'psycopg2'
+        )
+
+    def notify_slaves_ready(self, snapshot):
+        # PostgreSQL delivers the notification when the transaction commits,
+        # so listeners never wake up before worker_pid is actually cleared.
+        if self.supports_notify():
+            self.db.session.execute(
+                text('NOTIFY %s' % get_snapshot_channel(snapshot))
+            )
+
+    def listen_for_slaves_ready(self, snapshot):
+        connection = self.db.raw_connection()
+        try:
+            connection.set_isolation_level(0)
+            cursor = connection.cursor()
+            cursor.execute('LISTEN %s' % get_snapshot_channel(snapshot))
+            cursor.close()
+        except Exception:
+            connection.close()
+            raise
+        return connection
+
+    def is_waiting_for_slave_copy(self, snapshot):
+        state = Snapshot.get_ready_state(self.db.session, snapshot.id)
+        if state is None:
+            click.echo('')
+            click.echo("Snapshot was removed while waiting for it.")
+            sys.exit(1)
+        slaves_ready, worker_alive = state
+        if slaves_ready:
+            self.db.session.expire(snapshot, ['worker_pid'])
+        return not slaves_ready and worker_alive
+
+    def wait_for_slave_copy(self, snapshot, interval=1):
+        # Yields every `interval` seconds while the background copy is still
+        # running so that callers can show progress. Stops early if the
+        # worker process has died; snapshot.slaves_ready tells which one
+        # happened.
+        if not self.supports_notify():
+            while self.is_waiting_for_slave_copy(snapshot):
+                yield
+                sleep(interval)
+            return
+
+        connection = self.listen_for_slaves_ready(snapshot)
+        try:
+            # The worker may have finished before we started listening.
+            waiting = self.is_waiting_for_slave_copy(snapshot)
+            while waiting:
+                if not select.select([connection], [], [], interval)[0]:
+                    if self.is_copy_process_running(snapshot):
+                        yield
+                    else:
+                        # The worker exits right after committing, so ask
+                        # the database before deciding that it died.
+                        waiting = self.is_waiting_for_slave_copy(snapshot)
+                    continue
+                connection.poll()
+                if connection.notifies:
+                    del connection.notifies[:]
+                    waiting = self.is_waiting_for_slave_copy(snapshot)
+        finally:
+            connection.detach()
+            connection.close()
+
     def is_copy_process_running(self, snapshot):
         return pid_exists(snapshot.worker_pid)
 
@@ -232,16 +331,48 @@ class Stellar(object):
 
         databases = set(self.operations.list_of_databases())
 
-        for database in filter(
+        orphans = sorted(filter(
             lambda database: (
                 database.startswith('stellar_') and
                 database != 'stellar_data'
             ),
             (databases-stellar_databases)
-        ):
-            self.operations.remove_database(database)
-            if after_delete:
-                after_delete(database)
+        ))
+        # DROP DATABASE mostly waits on the server, so run a few at once.
+        # Results are reported in submission order, and a failure doesn't
+        # stop the remaining drops from being reported before the first
+        # error is raised.
+        error = None
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(self.remove_orphan_database, database)
+                for database in orphans
+            ]
+            for future in futures:
+                try:
+                    database = future.result()
+                except Exception as e:
+                    logger.error('Could not delete database: %s' % e)
+                    error = error or e
+                    continue
+                if after_delete:
+                    after_delete(database)
+        if error is not None:
+            raise error
+
+    def remove_orphan_database(self, database):
+        # The pooled connection is only used to terminate other sessions;
+        # sqlalchemy_utils opens its own engine for the DROP itself.
+        raw_conn = self.raw_db.connect()
+        try:
+            try:
+                raw_conn.connection.set_isolation_level(0)
+            except AttributeError:
+                logger.info('Could not set isolation level to 0')
+            Operations(raw_conn, self.config).remove_database(database)
+        finally:
+            raw_conn.close()
+        return database
 
     @property
     def default_snapshot_name(self):
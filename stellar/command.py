@@ -1,20 +1,60 @@
 import textwrap
 import sys
-from datetime import datetime
-from time import sleep
 
-import humanize
 import click
-import logging
-from sqlalchemy import create_engine
-from sqlalchemy.exc import ArgumentError, OperationalError
 
-from .app import Stellar, __version__
-from .config import InvalidConfig, MissingConfig, load_config, save_config
-from .operations import database_exists, list_of_databases, SUPPORTED_DIALECTS
+from .version import __version__
+
+
+def _plural(count, unit):
+    return '%d %s%s' % (count, unit, '' if count == 1 else 's')
+
+
+def _naturaltime(delta):
+    # Follows humanize.naturaltime: months are 30.5 days, years 365 days.
+    years, days = divmod(delta.days, 365)
+    seconds = delta.seconds
+    months = round(days / 30.5)
+
+    if years > 1:
+        return '%d years ago' % years
+    elif years == 1:
+        if months == 12:
+            return '2 years ago'
+        elif not days:
+            return 'a year ago'
+        elif not months:
+            return '1 year, %s ago' % _plural(days, 'day')
+        return '1 year, %s ago' % _plural(months, 'month')
+    elif days == 1:
+        return 'a day ago'
+    elif days:
+        if not months:
+            return '%d days ago' % days
+        elif months == 1:
+            return 'a month ago'
+        elif months == 12:
+            return 'a year ago'
+        return '%d months ago' % months
+    elif seconds < 1:
+        return 'now'
+    elif seconds == 1:
+        return 'a second ago'
+    elif seconds < 60:
+        return '%d seconds ago' % seconds
+    elif seconds < 3600:
+        minutes = round(seconds / 60)
+        if minutes == 60:
+            return 'an hour ago'
+        return 'a minute ago' if minutes == 1 else '%d minutes ago' % minutes
+    hours = round(seconds / 3600)
+    if hours == 24:
+        return 'a day ago'
+    return 'an hour ago' if hours == 1 else '%d hours ago' % hours
 
 
 def get_app():
+    from .app import Stellar
     app = Stellar()
     return app
 
@@ -48,7 +88,7 @@ def snapshot(name):
     app = get_app()
     name = name or app.default_snapshot_name
 
-    if app.get_snapshot(name):
+    if app.snapshot_exists(name):
         click.echo("Snapshot with name %s already exists" % name)
         sys.exit(1)
     else:
@@ -60,15 +100,14 @@ def snapshot(name):
 @stellar.command()
 def list():
     """Returns a list of snapshots"""
-    snapshots = get_app().get_snapshots()
+    from datetime import datetime
 
-    click.echo('\n'.join(
-        '%s: %s' % (
-            s.snapshot_name,
-            humanize.naturaltime(datetime.utcnow() - s.created_at)
-        )
-        for s in snapshots
-    ))
+    now = datetime.utcnow()
+    for snapshot_name, created_at in get_app().get_snapshots_listing():
+        click.echo('%s: %s' % (
+            snapshot_name,
+            _naturaltime(now - created_at)
+        ))
 
 
 @stellar.command()
@@ -82,7 +121,7 @@ def restore(name):
         if not snapshot:
             click.echo(
                 "Couldn't find any snapshots for project %s" %
-                load_config()['project_name']
+                app.config['project_name']
             )
             sys.exit(1)
     else:
@@ -97,18 +136,17 @@ def restore(name):
     # Check if slaves are ready
     if not snapshot.slaves_ready:
         if app.is_copy_process_running(snapshot):
-            sys.stdout.write(
-                'Waiting for background process(%s) to finish' %
-                snapshot.worker_pid
-            )
-            sys.stdout.flush()
-            while not snapshot.slaves_ready:
-                sys.stdout.write('.')
-                sys.stdout.flush()
-                sleep(1)
-                app.db.session.refresh(snapshot)
-            click.echo('')
-        else:
+            with click.progressbar(
+                app.wait_for_slave_copy(snapshot),
+                label=(
+                    'Waiting for background process(%s) to finish' %
+                    snapshot.worker_pid
+                ),
+                update_min_steps=2
+            ) as ticks:
+                for _ in ticks:
+                    pass
+        if not snapshot.slaves_ready:
             click.echo('Background process missing, doing slow restore.')
             app.inline_slave_copy(snapshot)
 
@@ -144,8 +182,7 @@ def rename(old_name, new_name):
         click.echo("Couldn't find snapshot %s" % old_name)
         sys.exit(1)
 
-    new_snapshot = app.get_snapshot(new_name)
-    if new_snapshot:
+    if app.snapshot_exists(new_name):
         click.echo("Snapshot with name %s already exists" % new_name)
         sys.exit(1)
 
@@ -174,6 +211,22 @@ def replace(name):
 @click.argument('project', required=False)
 def init(url, project):
     """Initializes Stellar configuration."""
+    import socket
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.engine.url import make_url
+    from sqlalchemy.exc import ArgumentError, OperationalError
+    from sqlalchemy.pool import NullPool
+
+    from .config import write_config
+    from .operations import (
+        CONNECT_TIMEOUT_DRIVERS,
+        DEFAULT_PORTS,
+        list_of_databases,
+        PROBE_DATABASES,
+        render_url,
+        SUPPORTED_DIALECTS,
+    )
 
     def prompt_url():
         msg = textwrap.dedent("""\
@@ -189,21 +242,49 @@ def init(url, project):
         if not url:
             url = prompt_url()
 
-        if url.count('/') == 2 and not url.endswith('/'):
-            url = url + '/'
+        try:
+            parsed_url = make_url(url)
+        except ArgumentError as err:
+            click.echo("Error: %s" % err)
+            url = None
+            continue
+
+        dialect_name = parsed_url.get_backend_name()
+        if dialect_name not in SUPPORTED_DIALECTS:
+            click.echo("Your engine dialect %s is not supported." % (
+                dialect_name
+            ))
+            click.echo("Supported dialects: %s" % (
+                ', '.join(SUPPORTED_DIALECTS)
+            ))
+            sys.exit(1)
 
-        # if (
-        #     url.count('/') == 3 and
-        #     url.endswith('/') and
-        #     url.startswith('postgresql://')
-        # ):
-        #     connection_url = url + 'template1'
-        # else:
-        #     connection_url = url
-        connection_url = url
+        # Without a host the driver connects over a unix socket.
+        if parsed_url.host and not parsed_url.host.startswith('/'):
+            try:
+                socket.create_connection((
+                    parsed_url.host,
+                    parsed_url.port or DEFAULT_PORTS[dialect_name]
+                ), timeout=2).close()
+            except OSError as err:
+                click.echo("Host unreachable: %s" % url)
+                click.echo("Error message: %s" % err)
+                click.echo('')
+                url = None
+                continue
 
+        probe_database = parsed_url.database or PROBE_DATABASES[dialect_name]
         try:
-            engine = create_engine(connection_url, echo=False)
+            if parsed_url.get_driver_name() in CONNECT_TIMEOUT_DRIVERS:
+                connect_args = {'connect_timeout': 3}
+            else:
+                connect_args = {}
+            engine = create_engine(
+                parsed_url.set(database=probe_database),
+                echo=False,
+                poolclass=NullPool,
+                connect_args=connect_args
+            )
         except ArgumentError as err:
             click.echo("Error: %s" % err)
             url = None
@@ -220,32 +301,22 @@ def init(url, project):
 
         url = None
 
-    if engine.dialect.name not in SUPPORTED_DIALECTS:
-        click.echo("Your engine dialect %s is not supported." % (
-            engine.dialect.name
-        ))
-        click.echo("Supported dialects: %s" % (
-            ', '.join(SUPPORTED_DIALECTS)
-        ))
-
-    if url.count('/') == 3 and url.endswith('/'):
-        while True:
-            click.echo("You have the following databases: %s" % ', '.join([
-                db for db in list_of_databases(conn)
-                if not db.startswith('stellar_')
-            ]))
+    db_name = parsed_url.database or None
+    if db_name is None:
+        databases = list_of_databases(conn, exclude_prefix='stellar_')
+        if not databases:
+            click.echo("Could not find any databases in %s" % url)
+            sys.exit(1)
 
-            db_name = click.prompt(
-                "Please enter the name of the database (eg. projectdb)"
-            )
-            if database_exists(conn, db_name):
-                break
-            else:
-                click.echo("Could not find database %s" % db_name)
-                click.echo('')
-    else:
-        db_name = url.rsplit('/', 1)[-1]
-        url = url.rsplit('/', 1)[0] + '/'
+        click.echo(
+            "You have the following databases: %s" % ', '.join(databases)
+        )
+        db_name = click.prompt(
+            "Please enter the name of the database (eg. projectdb)",
+            type=click.Choice(databases),
+            show_choices=False
+        )
+    conn.close()
 
     if project is None:
         project = click.prompt(
@@ -253,29 +324,29 @@ def init(url, project):
             default=db_name
         )
 
-    raw_url = url
-
-    if engine.dialect.name == 'postgresql':
-        raw_url = raw_url + db_name
+    if dialect_name == 'postgresql':
+        raw_url = parsed_url.set(database=db_name)
+    else:
+        raw_url = parsed_url.set(database='')
+    stellar_url = parsed_url.set(database='stellar_data')
 
-    with open('stellar.yaml', 'w') as project_file:
-        project_file.write(
-            textwrap.dedent("""\
-                project_name: {name}
-                tracked_databases: ['{db_name}']
-                url: '{raw_url}'
-                stellar_url: '{url}stellar_data'
-                """)
-            .format(name=project, db_name=db_name, raw_url=raw_url, url=url))
+    write_config('stellar.yaml', {
+        'project_name': project,
+        'tracked_databases': [db_name],
+        'url': render_url(raw_url),
+        'stellar_url': render_url(stellar_url),
+    })
 
     click.echo("Wrote stellar.yaml")
     click.echo('')
-    if engine.dialect.name == 'mysql':
+    if dialect_name == 'mysql':
         click.echo("Warning: MySQL support is still in beta.")
     click.echo("Tip: You probably want to take a snapshot: stellar snapshot")
 
 
 def main():
+    from .config import InvalidConfig, MissingConfig
+
     try:
         stellar()
     except MissingConfig:
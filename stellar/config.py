@@ -1,5 +1,9 @@
 import os
 import logging
+import stat
+import tempfile
+from functools import lru_cache
+
 import yaml
 from schema import Use, Schema, SchemaError, Optional
 
@@ -43,6 +47,12 @@ def get_config_path():
             return None
 
 
+# libyaml's C loader is several times faster than the pure-python one.
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+@lru_cache(maxsize=1)
 def load_config():
     config = {}
     current_directory = os.getcwd()
@@ -52,7 +62,7 @@ def load_config():
                 os.path.join(current_directory, 'stellar.yaml'),
                 'rb'
             ) as fp:
-                config = yaml.safe_load(fp)
+                config = yaml.load(fp, Loader=YamlLoader)
                 break
         except IOError:
             pass
@@ -76,7 +86,45 @@ def load_config():
         raise InvalidConfig(e)
 
 
+def get_file_mode(path):
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def write_config(path, config):
+    # Write to a temporary file next to the target and move it into place,
+    # so an interrupted write never leaves a truncated stellar.yaml behind.
+    content = yaml.dump(
+        config,
+        Dumper=YamlDumper,
+        sort_keys=False,
+        allow_unicode=True
+    )
+    mode = get_file_mode(path)
+    fp = tempfile.NamedTemporaryFile(
+        'w',
+        encoding='utf-8',
+        dir=os.path.dirname(os.path.abspath(path)),
+        prefix='stellar.',
+        suffix='.yaml.tmp',
+        delete=False
+    )
+    try:
+        with fp:
+            fp.write(content)
+        # NamedTemporaryFile is always created owner-only.
+        os.chmod(fp.name, mode)
+        os.replace(fp.name, path)
+    except BaseException:
+        os.remove(fp.name)
+        raise
+    load_config.cache_clear()
+
+
 def save_config(config):
     logging.getLogger(__name__).debug('save_config()')
-    with open(get_config_path(), "w") as fp:
-        yaml.dump(config, fp)
+    write_config(get_config_path(), config)
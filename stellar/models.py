@@ -3,6 +3,7 @@ import uuid
 from datetime import datetime
 
 import sqlalchemy as sa
+from psutil import pid_exists
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -29,6 +30,19 @@ class Snapshot(Base):
     def slaves_ready(self):
         return self.worker_pid is None
 
+    @classmethod
+    def get_ready_state(cls, session, id):
+        row = session.execute(
+            sa.select(cls.worker_pid).where(cls.id == id)
+        ).first()
+        if row is None:
+            return None
+        worker_pid = row[0]
+        return (
+            worker_pid is None,
+            worker_pid is not None and pid_exists(worker_pid)
+        )
+
     def __repr__(self):
         return "<Snapshot(snapshot_name=%r)>" % (
             self.snapshot_name
@@ -2,6 +2,8 @@ import logging
 import re
 
 import sqlalchemy_utils
+from sqlalchemy import text
+from sqlalchemy.engine.url import make_url
 
 logger = logging.getLogger(__name__)
 
@@ -11,18 +13,36 @@ SUPPORTED_DIALECTS = (
     'mysql'
 )
 
+DEFAULT_PORTS = {
+    'postgresql': 5432,
+    'mysql': 3306,
+}
+
+# DBAPI drivers that accept a connect_timeout connection argument.
+CONNECT_TIMEOUT_DRIVERS = (
+    'psycopg2',
+    'pymysql',
+    'mysqldb',
+)
+
+# Databases that always exist and can be connected to before the user has
+# picked one. PostgreSQL would otherwise default to a database named after
+# the user, which often doesn't exist.
+PROBE_DATABASES = {
+    'postgresql': 'template1',
+    'mysql': 'information_schema',
+}
+
 class NotSupportedDatabase(Exception):
     pass
 
 
+def render_url(url):
+    return make_url(url).render_as_string(hide_password=False)
+
+
 def get_engine_url(raw_conn, database):
-    url = str(raw_conn.engine.url)
-    if url.count('/') == 3 and url.endswith('/'):
-        return '%s%s' % (url, database)
-    else:
-        if not url.endswith('/'):
-            url += '/'
-        return '%s/%s' % ('/'.join(url.split('/')[0:-2]), database)
+    return render_url(raw_conn.engine.url.set(database=database))
 
 
 def _get_pid_column(raw_conn):
@@ -149,21 +169,31 @@ def rename_database(raw_conn, from_database, to_database):
         raise NotSupportedDatabase()
 
 
-def list_of_databases(raw_conn):
-    logger.debug('list_of_databases()')
+def list_of_databases(raw_conn, exclude_prefix=None):
+    logger.debug('list_of_databases(exclude_prefix=%r)', exclude_prefix)
+    if exclude_prefix is None:
+        pattern = None
+    else:
+        pattern = re.sub(r'([\\%_])', r'\\\1', exclude_prefix) + '%'
+
     if raw_conn.engine.dialect.name == 'postgresql':
-        return [
-            row[0]
-            for row in raw_conn.execute('''
-                SELECT datname FROM pg_database
-                WHERE datistemplate = false
-            ''')
-        ]
+        query = '''
+            SELECT datname FROM pg_database
+            WHERE datistemplate = false
+        '''
+        if pattern is not None:
+            query += " AND datname NOT LIKE :pattern ESCAPE '\\'"
     elif raw_conn.engine.dialect.name == 'mysql':
-        return [
-            row[0]
-            for row in raw_conn.execute('''SHOW DATABASES''')
-        ]
+        query = '''
+            SELECT schema_name FROM information_schema.schemata
+        '''
+        if pattern is not None:
+            query += " WHERE schema_name NOT LIKE :pattern"
     else:
         raise NotSupportedDatabase()
 
+    params = {} if pattern is None else {'pattern': pattern}
+    return [
+        row[0]
+        for row in raw_conn.execute(text(query), params)
+    ]
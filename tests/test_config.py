@@ -0,0 +1,77 @@
+import os
+import stat
+
+import pytest
+
+from stellar import config
+from stellar.config import load_config, write_config
+
+
+def make_config(project_name):
+    return {
+        'project_name': project_name,
+        'tracked_databases': ['projectdb'],
+        'url': 'postgresql://localhost:5432/projectdb',
+        'stellar_url': 'postgresql://localhost:5432/stellar_data',
+    }
+
+
+@pytest.fixture(autouse=True)
+def project_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    load_config.cache_clear()
+    yield tmp_path
+    load_config.cache_clear()
+
+
+def test_write_config_round_trips_through_load_config():
+    write_config('stellar.yaml', make_config("it's a project"))
+    loaded = load_config()
+    assert loaded['project_name'] == "it's a project"
+    assert loaded['tracked_databases'] == ['projectdb']
+    assert loaded['logging'] == 30
+
+
+def test_write_config_clears_load_config_cache():
+    write_config('stellar.yaml', make_config('first'))
+    assert load_config()['project_name'] == 'first'
+    write_config('stellar.yaml', make_config('second'))
+    assert load_config()['project_name'] == 'second'
+
+
+def test_write_config_follows_umask_for_new_files():
+    umask = os.umask(0o022)
+    try:
+        write_config('stellar.yaml', make_config('project'))
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(os.stat('stellar.yaml').st_mode) == 0o644
+
+
+def test_write_config_keeps_mode_of_existing_file():
+    write_config('stellar.yaml', make_config('project'))
+    os.chmod('stellar.yaml', 0o640)
+    write_config('stellar.yaml', make_config('project'))
+    assert stat.S_IMODE(os.stat('stellar.yaml').st_mode) == 0o640
+
+
+def test_write_config_removes_temporary_file_on_interrupt(
+    project_dir, monkeypatch
+):
+    write_config('stellar.yaml', make_config('project'))
+
+    def interrupt(src, dst):
+        raise KeyboardInterrupt()
+    monkeypatch.setattr(config.os, 'replace', interrupt)
+
+    with pytest.raises(KeyboardInterrupt):
+        write_config('stellar.yaml', make_config('other'))
+    assert os.listdir(str(project_dir)) == ['stellar.yaml']
+    assert load_config()['project_name'] == 'project'
+
+
+def test_write_config_keeps_unicode_readable():
+    write_config('stellar.yaml', make_config('projekt ü'))
+    with open('stellar.yaml', 'rb') as fp:
+        assert 'project_name: projekt ü'.encode('utf-8') in fp.read()
+    assert load_config()['project_name'] == 'projekt ü'
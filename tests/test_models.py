@@ -1,4 +1,9 @@
-from stellar.models import get_unique_hash, Table, Snapshot
+import os
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from stellar.models import get_unique_hash, Base, Table, Snapshot
 
 
 def test_get_unique_hash():
@@ -17,3 +22,22 @@ def test_table():
         )
     )
     assert len(table.get_table_name('master')) == 24
+
+
+def test_snapshot_get_ready_state():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    snapshot = Snapshot(
+        snapshot_name='snapshot',
+        project_name='myproject',
+        worker_pid=os.getpid()
+    )
+    session.add(snapshot)
+    session.commit()
+    assert Snapshot.get_ready_state(session, snapshot.id) == (False, True)
+
+    snapshot.worker_pid = None
+    session.commit()
+    assert Snapshot.get_ready_state(session, snapshot.id) == (True, False)
+    assert Snapshot.get_ready_state(session, snapshot.id + 1) is None
@@ -1,6 +1,10 @@
 import pytest
 
-from stellar.operations import _get_pid_column
+from stellar.operations import (
+    _get_pid_column,
+    list_of_databases,
+    NotSupportedDatabase,
+)
 
 
 class ConnectionMock(object):
@@ -27,3 +31,69 @@ class TestGetPidColumn(object):
     def test_returns_pid_for_version_equal_or_newer_than_9_2(self, version):
         raw_conn = ConnectionMock(version=version)
         assert _get_pid_column(raw_conn) == 'pid'
+
+
+class DialectMock(object):
+    def __init__(self, name):
+        self.name = name
+
+
+class EngineMock(object):
+    def __init__(self, dialect_name):
+        self.dialect = DialectMock(dialect_name)
+
+
+class ListConnectionMock(object):
+    def __init__(self, dialect_name, databases):
+        self.engine = EngineMock(dialect_name)
+        self.databases = databases
+        self.queries = []
+
+    def execute(self, query, params):
+        self.queries.append((str(query), params))
+        return [(database,) for database in self.databases]
+
+
+class TestListOfDatabases(object):
+    @pytest.mark.parametrize('dialect', ['postgresql', 'mysql'])
+    def test_lists_all_databases_without_prefix(self, dialect):
+        raw_conn = ListConnectionMock(dialect, ['projectdb', 'stellar_data'])
+        assert list_of_databases(raw_conn) == ['projectdb', 'stellar_data']
+
+        query, params = raw_conn.queries[0]
+        assert 'LIKE' not in query
+        assert ':pattern' not in query
+        assert params == {}
+
+    def test_postgresql_excludes_prefix_in_sql(self):
+        raw_conn = ListConnectionMock('postgresql', ['projectdb'])
+        assert list_of_databases(raw_conn, exclude_prefix='stellar_') == [
+            'projectdb'
+        ]
+
+        query, params = raw_conn.queries[0]
+        assert 'FROM pg_database' in query
+        assert "datname NOT LIKE :pattern ESCAPE '\\'" in query
+        assert params == {'pattern': 'stellar\\_%'}
+
+    def test_mysql_excludes_prefix_in_sql(self):
+        raw_conn = ListConnectionMock('mysql', ['projectdb'])
+        assert list_of_databases(raw_conn, exclude_prefix='stellar_') == [
+            'projectdb'
+        ]
+
+        query, params = raw_conn.queries[0]
+        assert 'FROM information_schema.schemata' in query
+        assert 'schema_name NOT LIKE :pattern' in query
+        # MySQL uses backslash as the LIKE escape character by default.
+        assert 'ESCAPE' not in query
+        assert params == {'pattern': 'stellar\\_%'}
+
+    def test_escapes_like_wildcards_in_prefix(self):
+        raw_conn = ListConnectionMock('postgresql', [])
+        list_of_databases(raw_conn, exclude_prefix='a%b\\c_')
+        assert raw_conn.queries[0][1] == {'pattern': 'a\\%b\\\\c\\_%'}
+
+    def test_raises_for_unsupported_dialect(self):
+        with pytest.raises(NotSupportedDatabase):
+            list_of_databases(ListConnectionMock('sqlite', []))
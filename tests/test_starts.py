@@ -1,6 +1,8 @@
+import os
 import pytest
 import stellar
 import tempfile
+import time
 
 
 class TestCase(object):
@@ -48,3 +50,222 @@ class Test(TestCase):
             lambda x: None
         )
         app = stellar.app.Stellar()
+
+    def test_snapshot_exists(self, monkeypatch):
+        monkeypatch.setattr(
+            stellar.app.Stellar,
+            'create_stellar_database',
+            lambda x: None
+        )
+        app = stellar.app.Stellar()
+        assert not app.snapshot_exists('snap1')
+
+        app.db.session.add(stellar.models.Snapshot(
+            snapshot_name='snap1',
+            project_name='test_project'
+        ))
+        app.db.session.add(stellar.models.Snapshot(
+            snapshot_name='snap2',
+            project_name='other_project'
+        ))
+        app.db.session.commit()
+        assert app.snapshot_exists('snap1')
+        assert not app.snapshot_exists('snap2')
+
+
+class NotifyConnectionMock(object):
+    # Stands in for a psycopg2 connection; the read end of a pipe lets
+    # select.select() wait on it like on a real socket.
+    def __init__(self):
+        self.read_fd, self.write_fd = os.pipe()
+        self.notifies = []
+
+    def fileno(self):
+        return self.read_fd
+
+    def notify(self, channel):
+        self.notifies.append(channel)
+        os.write(self.write_fd, b'x')
+
+    def poll(self):
+        os.read(self.read_fd, 1)
+
+    def detach(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TestWaitForSlaveCopy(TestCase):
+    @pytest.fixture
+    def app(self, monkeypatch):
+        monkeypatch.setattr(
+            stellar.app.Stellar,
+            'create_stellar_database',
+            lambda x: None
+        )
+        return stellar.app.Stellar()
+
+    @pytest.fixture
+    def connection(self, app, monkeypatch):
+        connection = NotifyConnectionMock()
+        monkeypatch.setattr(app, 'supports_notify', lambda: True)
+        monkeypatch.setattr(
+            app,
+            'listen_for_slaves_ready',
+            lambda snapshot: connection
+        )
+        yield connection
+        os.close(connection.read_fd)
+        os.close(connection.write_fd)
+
+    def create_snapshot(self, app, worker_pid):
+        snapshot = stellar.models.Snapshot(
+            snapshot_name='snap1',
+            project_name='test_project',
+            worker_pid=worker_pid
+        )
+        app.db.session.add(snapshot)
+        app.db.session.commit()
+        return snapshot
+
+    def finish_copy(self, app, snapshot):
+        # Clears worker_pid behind the ORM's back, like the worker process.
+        with app.db.begin() as conn:
+            conn.execute(
+                stellar.models.Snapshot.__table__.update().where(
+                    stellar.models.Snapshot.id == snapshot.id
+                ).values(worker_pid=None)
+            )
+
+    def test_notify_wakes_up_when_copy_finishes(self, app, connection):
+        snapshot = self.create_snapshot(app, os.getpid())
+        ticks = 0
+        for _ in app.wait_for_slave_copy(snapshot, interval=0.01):
+            ticks += 1
+            if ticks == 2:
+                self.finish_copy(app, snapshot)
+                connection.notify('stellar_snapshot_%d' % snapshot.id)
+            assert ticks < 10
+        assert ticks == 2
+        assert snapshot.slaves_ready
+
+    def test_notify_rechecks_database_when_worker_exits(
+        self, app, connection, monkeypatch
+    ):
+        snapshot = self.create_snapshot(app, os.getpid())
+
+        def worker_exits_after_commit(pid):
+            self.finish_copy(app, snapshot)
+            return False
+        monkeypatch.setattr(
+            stellar.app,
+            'pid_exists',
+            worker_exits_after_commit
+        )
+
+        assert not list(app.wait_for_slave_copy(snapshot, interval=0.01))
+        assert snapshot.slaves_ready
+
+    def test_stops_when_snapshot_is_removed(self, app, connection):
+        snapshot = self.create_snapshot(app, os.getpid())
+        snapshot_id = snapshot.id
+        with app.db.begin() as conn:
+            conn.execute(
+                stellar.models.Snapshot.__table__.delete().where(
+                    stellar.models.Snapshot.id == snapshot_id
+                )
+            )
+        with pytest.raises(SystemExit):
+            list(app.wait_for_slave_copy(snapshot, interval=0.01))
+
+    def test_notify_copy_finished_before_listen(self, app, connection):
+        snapshot = self.create_snapshot(app, os.getpid())
+        assert not snapshot.slaves_ready
+        self.finish_copy(app, snapshot)
+
+        assert not list(app.wait_for_slave_copy(snapshot, interval=0.01))
+        assert snapshot.slaves_ready
+
+    def test_notify_stops_when_worker_dies(
+        self, app, connection, monkeypatch
+    ):
+        snapshot = self.create_snapshot(app, os.getpid())
+        ticks = 0
+        for _ in app.wait_for_slave_copy(snapshot, interval=0.01):
+            ticks += 1
+            monkeypatch.setattr(stellar.app, 'pid_exists', lambda pid: False)
+            monkeypatch.setattr(
+                stellar.models,
+                'pid_exists',
+                lambda pid: False
+            )
+        assert ticks == 1
+        assert not snapshot.slaves_ready
+
+    def test_poll_stops_when_copy_finishes(self, app, monkeypatch):
+        monkeypatch.setattr(stellar.app, 'sleep', lambda seconds: None)
+        assert not app.supports_notify()
+        snapshot = self.create_snapshot(app, os.getpid())
+        ticks = 0
+        for _ in app.wait_for_slave_copy(snapshot):
+            ticks += 1
+            if ticks == 3:
+                self.finish_copy(app, snapshot)
+            assert ticks < 10
+        assert ticks == 3
+        assert snapshot.slaves_ready
+
+    def test_poll_stops_when_worker_dies(self, app, monkeypatch):
+        monkeypatch.setattr(stellar.app, 'sleep', lambda seconds: None)
+        monkeypatch.setattr(stellar.models, 'pid_exists', lambda pid: False)
+        snapshot = self.create_snapshot(app, os.getpid())
+
+        assert not list(app.wait_for_slave_copy(snapshot))
+        assert not snapshot.slaves_ready
+
+    def test_poll_copy_already_finished(self, app, monkeypatch):
+        monkeypatch.setattr(stellar.app, 'sleep', lambda seconds: None)
+        snapshot = self.create_snapshot(app, None)
+
+        assert not list(app.wait_for_slave_copy(snapshot))
+        assert snapshot.slaves_ready
+
+
+class TestDeleteOrphanSnapshots(TestCase):
+    def test_reports_every_deleted_database_before_raising(
+        self, monkeypatch
+    ):
+        monkeypatch.setattr(
+            stellar.app.Stellar,
+            'create_stellar_database',
+            lambda x: None
+        )
+        app = stellar.app.Stellar()
+        monkeypatch.setattr(
+            app.operations,
+            'list_of_databases',
+            lambda: [
+                'stellar_data', 'stellar_a', 'stellar_b', 'stellar_c', 'other'
+            ]
+        )
+
+        def remove_orphan_database(database):
+            # Finish out of order to check that reporting doesn't follow
+            # completion order.
+            if database == 'stellar_a':
+                time.sleep(0.05)
+            if database == 'stellar_b':
+                raise RuntimeError('could not drop %s' % database)
+            return database
+        monkeypatch.setattr(
+            app,
+            'remove_orphan_database',
+            remove_orphan_database
+        )
+
+        deleted = []
+        with pytest.raises(RuntimeError):
+            app.delete_orphan_snapshots(deleted.append)
+        assert deleted == ['stellar_a', 'stellar_c']